@@ -0,0 +1,40 @@
+"""Helpers shared by the CSV-writing example drivers.
+
+analyze_essay.py and analyze_poem.py both flatten rhyme_analysis.analyse()
+results into CSV rows; the pieces they have in common live here.
+"""
+
+import functools
+import os
+import sys
+
+# Allow imports from the parent directory
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from rhyme_analysis import _parse_lines, analyse
+
+
+@functools.lru_cache(maxsize=4096)
+def _analyse_cached(lines):
+    """Memoised ``analyse()`` keyed on a tuple of line texts.
+
+    Line parses come from rhyme_analysis's parse cache, so lines already
+    parsed for scheme detection (or by an earlier group) are not parsed
+    again.  The returned dict is shared between calls and must not be
+    mutated.
+    """
+    parsed = _parse_lines([l.strip() for l in lines])
+    return analyse(list(lines), parsed=parsed)
+
+
+def _rime_words(rime_seg):
+    """Distinct words (in order) that contribute to the rime segment."""
+    return list(dict.fromkeys(w for _, _, w in rime_seg))
+
+
+def _rime_morphemes(rime_seg):
+    """Distinct (label, word) morpheme tags that the rime spans, in order."""
+    return [
+        f"{lbl}({w})"
+        for lbl, w in dict.fromkeys((lbl, w) for _, lbl, w in rime_seg)
+    ]
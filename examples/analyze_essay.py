@@ -8,15 +8,22 @@ and writes the results to a CSV file in this directory.
 import csv
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Allow imports from the parent directory
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from rhyme_analysis import analyse, _seq_to_ipa, _to_ipa
+from _rhyme_csv import _analyse_cached, _rime_words, _rime_morphemes
 
 ESSAY_PATH = os.path.join(os.path.dirname(__file__), "essay-on-man.txt")
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "couplet_rhymes.csv")
 
+# Output is buffered in large blocks and rows are handed to the CSV writer
+# in batches, keeping per-row write() calls off the hot path.  Each full
+# batch is flushed so a long run's CSV fills in as it goes.
+WRITE_BUFFER_SIZE = 1 << 20
+WRITE_BATCH_ROWS = 256
+
 CSV_FIELDS = [
     "couplet",
     "line1_num",
@@ -35,36 +42,57 @@ CSV_FIELDS = [
 ]
 
 
-def _rime_words(rime_seg):
-    """Distinct words (in order) that contribute to the rime segment."""
-    seen = set()
-    words = []
-    for _, _, w in rime_seg:
-        if w not in seen:
-            seen.add(w)
-            words.append(w)
-    return words
-
-
-def _rime_morphemes(rime_seg):
-    """Distinct (label, word) morpheme tags that the rime spans, in order."""
-    seen = set()
-    morphemes = []
-    for _, lbl, w in rime_seg:
-        key = (lbl, w)
-        if key not in seen:
-            seen.add(key)
-            morphemes.append(f"{lbl}({w})")
-    return morphemes
-
-
 def read_lines(path):
-    """Read the essay, strip trailing whitespace, skip blank lines."""
+    """Read the essay in one pass and split it into lines, skipping blanks."""
     with open(path, encoding="utf-8") as f:
-        lines = [l.rstrip() for l in f if l.strip()]
+        lines = [l for l in f.read().splitlines() if l.strip()]
     return lines
 
 
+def _analyse_couplet(task):
+    """Analyse one couplet and return ``(row, error)`` for the CSV writer.
+
+    *row* is a tuple in ``CSV_FIELDS`` order.  Runs in a worker process,
+    so the analysis cache is per-process.  Exceptions are caught here so
+    that one bad couplet yields an empty row (and an error message)
+    instead of tearing down the pool.
+    """
+    i, line1, line2 = task
+    couplet_num = i + 1
+
+    try:
+        result = _analyse_cached((line1, line2))
+    except Exception as exc:
+        row = (
+            couplet_num, 2 * i + 1, 2 * i + 2,
+            line1.strip(), line2.strip(),
+            "", "", "", "", "", "", "", "", "",
+        )
+        return row, str(exc)
+
+    info1, info2 = result["lines"]
+    rime_phones = " ".join(result["rime_phones"])
+
+    # Same column order as CSV_FIELDS
+    row = (
+        couplet_num,
+        2 * i + 1,
+        2 * i + 2,
+        info1["text"],
+        info2["text"],
+        rime_phones,
+        result["rime_ipa"],
+        result["fuzzy"],
+        " | ".join(_rime_words(info1["rime"])),
+        " | ".join(_rime_words(info2["rime"])),
+        " + ".join(_rime_morphemes(info1["rime"])),
+        " + ".join(_rime_morphemes(info2["rime"])),
+        info1["rime_morpheme_count"],
+        info2["rime_morpheme_count"],
+    )
+    return row, None
+
+
 def main():
     lines = read_lines(ESSAY_PATH)
     n_couplets = len(lines) // 2
@@ -72,60 +100,29 @@ def main():
     print(f"Read {len(lines)} lines → {n_couplets} couplets")
     print(f"Writing results to {OUTPUT_PATH}")
 
-    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8") as fout:
-        writer = csv.DictWriter(fout, fieldnames=CSV_FIELDS)
-        writer.writeheader()
+    # Couplets are independent, so they are analysed in worker processes;
+    # the main process only reports progress and writes rows in order.
+    tasks = ((i, lines[2 * i], lines[2 * i + 1]) for i in range(n_couplets))
 
-        for i in range(n_couplets):
-            line1 = lines[2 * i]
-            line2 = lines[2 * i + 1]
-            couplet_num = i + 1
+    with open(OUTPUT_PATH, "w", newline="", encoding="utf-8",
+              buffering=WRITE_BUFFER_SIZE) as fout, \
+            ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        writer = csv.writer(fout)
+        writer.writerow(CSV_FIELDS)
 
+        batch = []
+        for row, error in ex.map(_analyse_couplet, tasks, chunksize=16):
+            couplet_num = row[0]
             if couplet_num % 50 == 0 or couplet_num == 1:
                 print(f"  couplet {couplet_num}/{n_couplets} …")
-
-            try:
-                result = analyse([line1, line2])
-            except Exception as exc:
-                print(f"  ⚠ couplet {couplet_num} failed: {exc}")
-                writer.writerow({
-                    "couplet": couplet_num,
-                    "line1_num": 2 * i + 1,
-                    "line2_num": 2 * i + 2,
-                    "line1_text": line1.strip(),
-                    "line2_text": line2.strip(),
-                    "rime_phones": "",
-                    "rime_ipa": "",
-                    "fuzzy": "",
-                    "line1_rhyme_words": "",
-                    "line2_rhyme_words": "",
-                    "line1_rime_morphemes": "",
-                    "line2_rime_morphemes": "",
-                    "line1_morpheme_count": "",
-                    "line2_morpheme_count": "",
-                })
-                continue
-
-            info1, info2 = result["lines"]
-            rime_phones = " ".join(result["rime_phones"])
-            rime_ipa = _seq_to_ipa(result["rime_phones"]) if result["rime_phones"] else ""
-
-            writer.writerow({
-                "couplet": couplet_num,
-                "line1_num": 2 * i + 1,
-                "line2_num": 2 * i + 2,
-                "line1_text": info1["text"],
-                "line2_text": info2["text"],
-                "rime_phones": rime_phones,
-                "rime_ipa": rime_ipa,
-                "fuzzy": result["fuzzy"],
-                "line1_rhyme_words": " | ".join(_rime_words(info1["rime"])),
-                "line2_rhyme_words": " | ".join(_rime_words(info2["rime"])),
-                "line1_rime_morphemes": " + ".join(_rime_morphemes(info1["rime"])),
-                "line2_rime_morphemes": " + ".join(_rime_morphemes(info2["rime"])),
-                "line1_morpheme_count": info1["rime_morpheme_count"],
-                "line2_morpheme_count": info2["rime_morpheme_count"],
-            })
+            if error is not None:
+                print(f"  ⚠ couplet {couplet_num} failed: {error}")
+            batch.append(row)
+            if len(batch) >= WRITE_BATCH_ROWS:
+                writer.writerows(batch)
+                batch.clear()
+                fout.flush()
+        writer.writerows(batch)
 
     print("Done.")
 
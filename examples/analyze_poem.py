@@ -16,8 +16,8 @@ import sys
 # Allow imports from the parent directory
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from rhyme_analysis import analyse, _seq_to_ipa
 from rhyme_scheme import detect_rhyme_scheme, group_by_scheme
+from _rhyme_csv import _analyse_cached, _rime_words, _rime_morphemes
 
 CSV_FIELDS = [
     "scheme_letter",
@@ -31,28 +31,7 @@ CSV_FIELDS = [
     "morpheme_count",
 ]
 
-
-def _rime_words(rime_seg):
-    """Distinct words (in order) that contribute to the rime segment."""
-    seen = set()
-    words = []
-    for _, _, w in rime_seg:
-        if w not in seen:
-            seen.add(w)
-            words.append(w)
-    return words
-
-
-def _rime_morphemes(rime_seg):
-    """Distinct (label, word) morpheme tags that the rime spans, in order."""
-    seen = set()
-    morphemes = []
-    for _, lbl, w in rime_seg:
-        key = (lbl, w)
-        if key not in seen:
-            seen.add(key)
-            morphemes.append(f"{lbl}({w})")
-    return morphemes
+WRITE_BUFFER_SIZE = 1 << 20
 
 
 def _empty_row(letter, num, text):
@@ -81,7 +60,7 @@ def main():
     )
 
     with open(poem_path, encoding="utf-8") as f:
-        lines = [l.rstrip() for l in f if l.strip()]
+        lines = [l for l in f.read().splitlines() if l.strip()]
 
     print(f"Read {len(lines)} lines from {poem_path}")
 
@@ -115,54 +94,62 @@ def main():
     for i in range(1, max_size + 1):
         csv_fields.append(f"line{i}_morpheme_count")
 
-    with open(output_path, "w", newline="", encoding="utf-8") as fout:
-        writer = csv.DictWriter(fout, fieldnames=csv_fields)
-        writer.writeheader()
-
+    # Column index template: rows are plain lists filled by position.
+    # Per-line fields come in blocks of max_size columns, so line idx of
+    # a block sits at that block's offset + idx.
+    col = {name: k for k, name in enumerate(csv_fields)}
+    num_off = col["line1_num"]
+    text_off = col["line1_text"]
+    words_off = col["line1_rhyme_words"]
+    morph_off = col["line1_rime_morphemes"]
+    count_off = col["line1_morpheme_count"]
+
+    with open(output_path, "w", newline="", encoding="utf-8",
+              buffering=WRITE_BUFFER_SIZE) as fout:
+        writer = csv.writer(fout)
+        writer.writerow(csv_fields)
+
+        rows = []
         for letter in sorted(groups.keys()):
             group = groups[letter]
-            row = {"scheme_letter": letter}
+            row = [""] * len(csv_fields)
+            row[col["scheme_letter"]] = letter
             line_texts = [text for _, text in group]
 
             if len(group) < 2:
-                row["line1_num"] = group[0][0]
-                row["line1_text"] = group[0][1]
-                writer.writerow(row)
+                row[num_off] = group[0][0]
+                row[text_off] = group[0][1]
+                rows.append(row)
                 continue
 
             try:
-                result = analyse(line_texts)
+                result = _analyse_cached(tuple(line_texts))
             except Exception as exc:
                 print(f"  ⚠ group {letter} failed: {exc}")
                 for idx, (num, text) in enumerate(group):
-                    row[f"line{idx + 1}_num"] = num
-                    row[f"line{idx + 1}_text"] = text
-                writer.writerow(row)
+                    row[num_off + idx] = num
+                    row[text_off + idx] = text
+                rows.append(row)
                 continue
 
-            row["rime_phones"] = " ".join(result["rime_phones"])
-            row["rime_ipa"] = (
-                _seq_to_ipa(result["rime_phones"])
-                if result["rime_phones"]
-                else ""
-            )
-            row["fuzzy"] = result["fuzzy"]
+            row[col["rime_phones"]] = " ".join(result["rime_phones"])
+            row[col["rime_ipa"]] = result["rime_ipa"]
+            row[col["fuzzy"]] = result["fuzzy"]
 
             for idx, (num, _) in enumerate(group):
-                i = idx + 1
                 info = result["lines"][idx]
-                row[f"line{i}_num"] = num
-                row[f"line{i}_text"] = info["text"]
-                row[f"line{i}_rhyme_words"] = " | ".join(
-                    _rime_words(info["rime"])
-                )
-                row[f"line{i}_rime_morphemes"] = " + ".join(
-                    _rime_morphemes(info["rime"])
-                )
-                row[f"line{i}_morpheme_count"] = info["rime_morpheme_count"]
-
-            writer.writerow(row)
+                row[num_off + idx] = num
+                row[text_off + idx] = info["text"]
+                row[words_off + idx] = " | ".join(_rime_words(info["rime"]))
+                row[morph_off + idx] = " + ".join(_rime_morphemes(info["rime"]))
+                row[count_off + idx] = info["rime_morpheme_count"]
+
+            rows.append(row)
+
+        writer.writerows(rows)
 
+    info = _analyse_cached.cache_info()
+    print(f"analyse() cache: {info.hits} hits, {info.misses} misses")
     print("Done.")
 
 
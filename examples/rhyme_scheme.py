@@ -16,9 +16,9 @@ import sys
 # Allow imports from the parent directory
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from morpho_parser import parse
 from rhyme_analysis import (
-    _line_tail, _find_common_rime, _is_vowel, _stress, _seq_to_ipa,
+    _line_tail, _find_common_rime, _tail_vowels, _base, _is_vowel, _stress,
+    _soundex, _seq_to_ipa, _VOWEL_NEIGHBORS, _parse_lines,
 )
 
 
@@ -44,7 +44,7 @@ def rime_candidates(line):
         Each candidate is a list of ``(phone, morpheme_label, word)``
         tuples running from the stressed vowel to the end of the line.
     """
-    parsed = parse(line.strip())
+    parsed = _parse_lines([line.strip()])[0]
 
     # Flatten all phones with morpheme and word info
     flat = []
@@ -90,6 +90,42 @@ def rime_candidates(line):
     return candidates
 
 
+def _rime_key(tail):
+    """Exact-rhyme key for a line tail.
+
+    The stress-stripped phones from the last stressed vowel (or, failing
+    that, the last vowel) to the end of the tail.  Tails with equal keys
+    always share a rime under ``_find_common_rime``.  Returns ``None``
+    for a tail without vowels.
+    """
+    phones = [ph for ph, _, _ in tail]
+    vowels = [i for i, ph in enumerate(phones) if _is_vowel(ph)]
+    if not vowels:
+        return None
+    stressed = [i for i in vowels if _stress(phones[i]) in ("1", "2")]
+    start = stressed[-1] if stressed else vowels[-1]
+    return tuple(_base(ph) for ph in phones[start:])
+
+
+def _last_vowel_class(tail):
+    """Vowel class of the final nucleus in *tail*, or ``None`` if it has none."""
+    for ph, _, _ in reversed(tail):
+        if _is_vowel(ph):
+            return _soundex(ph)
+    return None
+
+
+def _nuclei_compatible(a, b):
+    """True if final-nucleus classes *a* and *b* could start a common rime.
+
+    Mirrors the first vowel test in ``_find_common_rime``: the classes
+    must be equal or neighbours.
+    """
+    if a is None or b is None:
+        return False
+    return a == b or frozenset({a, b}) in _VOWEL_NEIGHBORS
+
+
 def detect_rhyme_scheme(lines):
     """Detect the end-rhyme scheme of a poem.
 
@@ -104,9 +140,23 @@ def detect_rhyme_scheme(lines):
         One uppercase letter per line indicating its rhyme group
         (e.g. ``['A', 'B', 'A', 'B', ...]``).
     """
-    parsed = [parse(line.strip()) for line in lines]
+    parsed = _parse_lines([line.strip() for line in lines])
     tails = [_line_tail(p) for p in parsed]
 
+    # Lines whose tails share an exact-rhyme key are grouped up front, so
+    # the full rime alignment only runs for pairs with differing keys.
+    keys = [_rime_key(t) for t in tails]
+    by_key = {}
+    for i, key in enumerate(keys):
+        if key is not None:
+            by_key.setdefault(key, []).append(i)
+
+    # Pairs whose final vowels are too far apart can never rhyme, so the
+    # full alignment is skipped for them.
+    buckets = [_last_vowel_class(t) for t in tails]
+    # Each tail takes part in many pairwise comparisons; find its vowels once.
+    vowel_idx = [_tail_vowels(t) for t in tails]
+
     scheme = [None] * len(lines)
     next_label = 0
 
@@ -114,10 +164,17 @@ def detect_rhyme_scheme(lines):
         if scheme[i] is not None:
             continue
         scheme[i] = chr(ord('A') + next_label)
+        for j in by_key.get(keys[i], ()):
+            if scheme[j] is None:
+                scheme[j] = scheme[i]
         for j in range(i + 1, len(lines)):
             if scheme[j] is not None:
                 continue
-            slices, _ = _find_common_rime([tails[i], tails[j]])
+            if not _nuclei_compatible(buckets[i], buckets[j]):
+                continue
+            slices, _ = _find_common_rime(
+                [tails[i], tails[j]], [vowel_idx[i], vowel_idx[j]]
+            )
             if slices[0]:
                 scheme[j] = scheme[i]
         next_label += 1
@@ -147,7 +204,7 @@ if __name__ == "__main__":
 
     path = sys.argv[1]
     with open(path, encoding="utf-8") as f:
-        lines = [l.rstrip() for l in f if l.strip()]
+        lines = [l for l in f.read().splitlines() if l.strip()]
 
     scheme = detect_rhyme_scheme(lines)
 
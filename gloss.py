@@ -30,10 +30,10 @@ _ARPA_TO_IPA = {
 }
 
 
-_VOWEL_BASES = {
+_VOWEL_BASES = frozenset({
     "AA", "AE", "AH", "AO", "AW", "AY", "EH", "ER", "EY",
     "IH", "IY", "OW", "OY", "UH", "UW",
-}
+})
 
 # Valid English syllable onsets (Maximal Onset Principle look-up)
 _VALID_ONSETS = {
@@ -57,6 +57,33 @@ _VALID_ONSETS = {
     ("S","K","W"), ("S","K","Y"), ("S","T","Y"), ("S","P","Y"),
 }
 
+# Onsets grouped by length, so the onset scan tests only clusters that exist
+_MAX_ONSET_LEN = max(len(o) for o in _VALID_ONSETS)
+_ONSETS_BY_LEN = {
+    n: frozenset(o for o in _VALID_ONSETS if len(o) == n)
+    for n in range(1, _MAX_ONSET_LEN + 1)
+}
+
+
+# Per-phone (base, stress, ipa) entries, filled in on first sight of a phone
+_PHONE_TABLE = {}
+
+
+def _resolve(phone):
+    """Return ``(base, stress, ipa)`` for one ARPAbet phone."""
+    entry = _PHONE_TABLE.get(phone)
+    if entry is None:
+        base = phone.rstrip("012")
+        stress = phone[len(base):]
+        if base == "AH" and stress == "0":
+            ipa = "ə"
+        elif base == "ER" and stress == "0":
+            ipa = "ɚ"
+        else:
+            ipa = _ARPA_TO_IPA.get(base, base)
+        entry = _PHONE_TABLE[phone] = (base, stress, ipa)
+    return entry
+
 
 def _arpa_to_ipa(arpa_str):
     """Convert a space-separated ARPAbet string to IPA.
@@ -64,54 +91,42 @@ def _arpa_to_ipa(arpa_str):
     Stress marks are placed at syllable onset following the Maximal
     Onset Principle, not immediately before the vowel nucleus.
     """
-    phones = arpa_str.split()
-    parsed = []
-    for p in phones:
-        base = p.rstrip("012")
-        stress = p[len(base):]
-        parsed.append((base, stress))
+    parsed = [_resolve(p) for p in arpa_str.split()]
 
     # Determine where each stress mark should be inserted.
     # For every stressed vowel, walk backwards through preceding consonants
     # and find the longest cluster that forms a valid English onset.
     stress_at = {}  # phone index → mark
-    for i, (base, stress) in enumerate(parsed):
+    for i, (base, stress, _) in enumerate(parsed):
         if stress not in ("1", "2"):
             continue
         mark = "ˈ" if stress == "1" else "ˌ"
 
-        # Collect consonants between this vowel and the previous one
+        # Find the previous vowel, then take the consonants in between
         j = i - 1
-        consonants = []
         while j >= 0 and parsed[j][0] not in _VOWEL_BASES:
-            consonants.insert(0, parsed[j][0])
             j -= 1
+        consonants = [parsed[k][0] for k in range(j + 1, i)]
 
         if j < 0:
             # Word-initial: all preceding consonants belong to the onset
             onset_start = 0
         else:
-            # Find the longest valid onset by trimming from the left
+            # Find the longest valid onset, trying the longest suffix first
             onset_start = i  # fallback: right before vowel
-            for k in range(len(consonants)):
-                if tuple(consonants[k:]) in _VALID_ONSETS:
-                    onset_start = (i - len(consonants)) + k
+            for n in range(min(_MAX_ONSET_LEN, len(consonants)), 0, -1):
+                if tuple(consonants[-n:]) in _ONSETS_BY_LEN[n]:
+                    onset_start = i - n
                     break
 
         stress_at[onset_start] = mark
 
     # Build IPA string
     ipa = []
-    for i, (base, stress) in enumerate(parsed):
+    for i, (_, _, phone_ipa) in enumerate(parsed):
         if i in stress_at:
             ipa.append(stress_at[i])
-
-        if base == "AH" and stress == "0":
-            ipa.append("ə")
-        elif base == "ER" and stress == "0":
-            ipa.append("ɚ")
-        else:
-            ipa.append(_ARPA_TO_IPA.get(base, base))
+        ipa.append(phone_ipa)
 
     return "".join(ipa)
 
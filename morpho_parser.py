@@ -8,16 +8,44 @@ g2p_en grapheme-to-phoneme fallback.
 
 Usage:
     python morpho_parser.py "The quick brown fox jumps over the lazy dog."
+    python morpho_parser.py --stdin < sentences.txt
+    python morpho_parser.py --serve /tmp/morpho.sock
 """
 
+import argparse
+import errno
+import os
+import socket
+import socketserver
+import stat
 import sys
 
-import spacy
-
-from phonology.phoneme_lookup import get_phonemes
+from phonology.phoneme_lookup import get_phonemes_batch
 from morphology.inflection import decompose_morphemes
 
-nlp = spacy.load("en_core_web_md")
+_nlp = None
+
+
+def _get_nlp():
+    """Return the shared spaCy pipeline, loading it on first use.
+
+    parse() only reads token text, POS/tag, and lemma, so the small model
+    (no word vectors) is enough, and the dependency parser and NER are
+    never loaded.  The rule-based lemmatizer needs only the tagger and
+    attribute_ruler, which stay in the pipeline.
+    """
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load("en_core_web_sm", exclude=["parser", "ner", "senter"])
+    return _nlp
+
+
+def __getattr__(name):
+    # Keep ``morpho_parser.nlp`` working without loading spaCy at import.
+    if name == "nlp":
+        return _get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Map inflected Penn Treebank tags to their citation-form (base) tag so that
 # lemma phoneme lookups use the right heteronym variant — e.g. the lemma of
@@ -30,6 +58,23 @@ _LEMMA_TAG = {
 }
 
 
+def _parse_doc(doc):
+    """Morpheme breakdown for every non-punctuation token of a spaCy doc."""
+    tokens = [token for token in doc if not token.is_punct]
+    words = [token.text.lower() for token in tokens]
+    lemmas = [token.lemma_.lower() for token in tokens]
+    tags = [token.tag_ for token in tokens]
+    lemma_tags = [_LEMMA_TAG.get(tag, tag) for tag in tags]
+    # One lookup for the whole doc lets unknown words share a g2p_en call.
+    phones = get_phonemes_batch(words + lemmas, tags + lemma_tags)
+    n = len(tokens)
+    results = []
+    for token, word_phones, lemma_phones in zip(tokens, phones[:n], phones[n:]):
+        morphemes = decompose_morphemes(word_phones, lemma_phones, token.pos_, token.tag_)
+        results.append({"word": token.text, "morphemes": morphemes})
+    return results
+
+
 def parse(sentence):
     """Parse *sentence* and return a list of per-word morpheme breakdowns.
 
@@ -37,18 +82,28 @@ def parse(sentence):
         list of dicts with keys ``word`` and ``morphemes``, where
         ``morphemes`` is a list of ``(phones, label)`` tuples.
     """
-    doc = nlp(sentence)
-    results = []
-    for token in doc:
-        if token.is_punct:
-            continue
-        word = token.text.lower()
-        lemma = token.lemma_.lower()
-        word_phones = get_phonemes(word, tag=token.tag_)
-        lemma_phones = get_phonemes(lemma, tag=_LEMMA_TAG.get(token.tag_, token.tag_))
-        morphemes = decompose_morphemes(word_phones, lemma_phones, token.pos_, token.tag_)
-        results.append({"word": token.text, "morphemes": morphemes})
-    return results
+    return _parse_doc(_get_nlp()(sentence))
+
+
+def parse_many(sentences, batch_size=64, n_process=1):
+    """Parse an iterable of sentences, yielding one ``parse()`` result each.
+
+    Sentences are streamed through ``nlp.pipe`` so spaCy can batch its
+    tokenisation and tagging, which amortises the per-call pipeline
+    overhead of ``parse()``.  *sentences* may be any iterable, including
+    a generator reading from a file or stdin; *batch_size* and
+    *n_process* are passed through to ``nlp.pipe``.
+
+    With ``n_process > 1`` spaCy tags batches in worker processes, while
+    phoneme lookup and decomposition stay in this one, against the CMU
+    dict and rule tables already loaded at import.  On Windows, where
+    spaCy's multiprocessing is unreliable, *n_process* is forced to 1.
+    """
+    if sys.platform == "win32":
+        n_process = 1
+    docs = _get_nlp().pipe(sentences, batch_size=batch_size, n_process=n_process)
+    for doc in docs:
+        yield _parse_doc(doc)
 
 
 def format_results(results):
@@ -59,7 +114,114 @@ def format_results(results):
     return "\n".join(lines)
 
 
-if __name__ == "__main__":
-    sentence = " ".join(sys.argv[1:]) if len(sys.argv) > 1 else "Much I marveled this ungainly fowl to hear discourse so plainly."
+class _ParseHandler(socketserver.StreamRequestHandler):
+    """Answer each line sent by a client with its formatted parse."""
+
+    def handle(self):
+        for raw in self.rfile:
+            sentence = raw.decode("utf-8", "replace").strip()
+            if not sentence:
+                continue
+            out = format_results(parse(sentence)) + "\n\n"
+            self.wfile.write(out.encode("utf-8"))
+
+
+def _remove_stale_socket(path):
+    """Unlink a socket at *path* that no server is listening on.
+
+    A socket that still accepts connections belongs to a running server
+    and raises ``EADDRINUSE``; a missing path or a non-socket file is
+    left alone (binding to the latter then fails as usual).
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            pass
+        except FileNotFoundError:
+            return
+        else:
+            raise OSError(errno.EADDRINUSE,
+                          "another server is listening on this socket", path)
+    os.unlink(path)
+
+
+def _serve(path):
+    """Serve ``parse()`` on a UNIX socket at *path* until interrupted.
+
+    The spaCy model, CMU dict and phoneme cache stay loaded between
+    requests, so each sentence costs only the parse itself.  Clients are
+    handled one at a time.  A stale socket left at *path* by a previous
+    server is replaced, but a live server's socket or any other existing
+    file is an error.  On exit the socket is removed only if *path* still
+    refers to the one this server bound.
+    """
+    _remove_stale_socket(path)
+    _get_nlp()
+    with socketserver.UnixStreamServer(path, _ParseHandler) as server:
+        st = os.stat(path)
+        bound = (st.st_dev, st.st_ino)
+        print(f"Serving on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                st = os.stat(path)
+                if (st.st_dev, st.st_ino) == bound:
+                    os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def _main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Decompose English words into morpheme phones."
+    )
+    ap.add_argument("sentence", nargs="*", help="sentence to parse")
+    ap.add_argument(
+        "--stdin", action="store_true",
+        help="parse one sentence per line from standard input",
+    )
+    ap.add_argument(
+        "--batch-size", type=int, default=64,
+        help="sentences per spaCy batch with --stdin (default: 64)",
+    )
+    ap.add_argument(
+        "-j", "--processes", type=int, default=1,
+        help="spaCy worker processes with --stdin; -1 uses every CPU "
+             "(default: 1)",
+    )
+    ap.add_argument(
+        "--serve", metavar="SOCKET",
+        help="keep the models loaded and parse lines sent to this UNIX socket",
+    )
+    args = ap.parse_args(argv)
+
+    if args.serve:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            ap.error("--serve needs UNIX domain socket support")
+        _serve(args.serve)
+        return
+
+    if args.stdin:
+        sentences = (line.strip() for line in sys.stdin if line.strip())
+        for results in parse_many(sentences, batch_size=args.batch_size,
+                                  n_process=args.processes):
+            print(format_results(results))
+            print()
+        return
+
+    sentence = " ".join(args.sentence) if args.sentence else "Much I marveled this ungainly fowl to hear discourse so plainly."
     results = parse(sentence)
     print(format_results(results))
+
+
+if __name__ == "__main__":
+    _main()
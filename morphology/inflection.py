@@ -4,6 +4,8 @@ from pathlib import Path
 
 import yaml
 
+from phonology._yaml import _YamlLoader
+
 # ── Load inflection rules from YAML ─────────────────────────────────────────
 
 _RULES_PATH = Path(__file__).with_name("inflection_rules.yaml")
@@ -16,12 +18,43 @@ def _load_rules(path=_RULES_PATH):
     format expected by decompose_morphemes().
     """
     with open(path, encoding="utf-8") as f:
-        raw = yaml.safe_load(f)
+        raw = yaml.load(f, Loader=_YamlLoader)
     return [(r["pos"], r["tag"], r["suffixes"], r["label"]) for r in raw]
 
 
 INFLECTION_RULES = _load_rules()
 
+
+def _build_suffix_trie(suffixes, label):
+    """Build a trie over *suffixes* keyed by phonemes read right to left.
+
+    Each node is a dict from phoneme to child node; a node that ends a
+    suffix also maps ``None`` to the suffix's normalised phone string for
+    *label*, ready to return.
+    """
+    root = {}
+    for suffix in suffixes:
+        node = root
+        for phone in reversed(suffix):
+            node = node.setdefault(phone, {})
+        node.setdefault(None, " ".join(_normalize_suffix(suffix, label)))
+    return root
+
+
+def _index_rules(rules):
+    """Index rules by ``(pos, tag)`` for direct lookup.
+
+    Returns a dict mapping ``(pos, tag)`` to ``(trie, label)``, where
+    *trie* is built by _build_suffix_trie().  Only the first rule for a
+    given pair is kept, as only the first would ever match.
+    """
+    index = {}
+    for pos, tag, suffixes, label in rules:
+        if (pos, tag) not in index:
+            index[pos, tag] = (_build_suffix_trie(suffixes, label), label)
+    return index
+
+
 # Surface-to-underlying normalisation: devoiced allophones → canonical morpheme
 _SUFFIX_NORMALIZE = {
     "PAST":      {"T": "D"},
@@ -39,6 +72,9 @@ def _normalize_suffix(phones, label):
     return [mapping.get(p, p) for p in phones]
 
 
+_RULE_INDEX = _index_rules(INFLECTION_RULES)
+
+
 def decompose_morphemes(word_phones, lemma_phones, pos, tag):
     """Split a word's phonemes into root morpheme + inflectional suffix.
 
@@ -46,24 +82,29 @@ def decompose_morphemes(word_phones, lemma_phones, pos, tag):
     If the word is uninflected or irregular, the whole word is returned as one
     morpheme (irregular forms are tagged e.g. "VERB<PAST>").
     """
-    word_str = " ".join(word_phones)
+    word_phones = tuple(word_phones)
+    lemma_phones = tuple(lemma_phones)
 
     if word_phones == lemma_phones:
-        return [(word_str, pos)]
-
-    for rule_pos, rule_tag, candidates, label in INFLECTION_RULES:
-        if pos == rule_pos and tag == rule_tag:
-            for suffix in candidates:
-                n = len(suffix)
-                if (len(word_phones) > n
-                        and word_phones[-n:] == suffix
-                        and word_phones[:-n] == lemma_phones):
-                    actual = _normalize_suffix(word_phones[-n:], label)
-                    return [
-                        (" ".join(word_phones[:-n]), pos),
-                        (" ".join(actual), label),
-                    ]
-            # Rule matched but no clean suffix strip → irregular form
-            return [(word_str, f"{pos}<{label}>")]
-
-    return [(word_str, pos)]
+        return [(" ".join(word_phones), pos)]
+
+    rule = _RULE_INDEX.get((pos, tag))
+    if rule is None:
+        return [(" ".join(word_phones), pos)]
+
+    trie, label = rule
+    # Only a suffix of exactly this length can leave lemma_phones behind,
+    # so walk the word backwards through the trie that many phonemes.
+    n = len(word_phones) - len(lemma_phones)
+    if 0 < n < len(word_phones):
+        node = trie
+        for phone in word_phones[:-n - 1:-1]:
+            node = node.get(phone)
+            if node is None:
+                break
+        else:
+            suffix_str = node.get(None)
+            if suffix_str is not None and word_phones[:-n] == lemma_phones:
+                return [(" ".join(lemma_phones), pos), (suffix_str, label)]
+    # Rule matched but no clean suffix strip → irregular form
+    return [(" ".join(word_phones), f"{pos}<{label}>")]
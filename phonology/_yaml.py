@@ -0,0 +1,8 @@
+"""YAML loader shared by the modules that read the rule and heteronym tables."""
+
+# Prefer the libyaml-backed loader; fall back to pure Python if PyYAML was
+# built without it.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 """Extract words with multiple CMU Dict pronunciations into heteronyms.yaml.
 
-Parses the locally-cached CMU Pronouncing Dictionary (.cmudict-0.7b) and
+Parses the locally-cached CMU Pronouncing Dictionary (.cmudict-0.7b.gz) and
 writes every multi-pronunciation word into heteronyms.yaml.  Existing
 curated entries (those with non-empty ``tags`` lists) are preserved;
 only new words are appended with empty tags for the user to fill in.
@@ -11,11 +11,14 @@ Usage:
 """
 
 from pathlib import Path
-import re
+import gzip
+import string
 
 import yaml
 
-_CMUDICT_CACHE = Path(__file__).with_name(".cmudict-0.7b")
+from phonology._yaml import _YamlLoader
+
+_CMUDICT_CACHE = Path(__file__).with_name(".cmudict-0.7b.gz")
 _HETERONYMS_PATH = Path(__file__).with_name("heteronyms.yaml")
 
 _YAML_HEADER = """\
@@ -45,20 +48,20 @@ def _parse_cmudict(path=_CMUDICT_CACHE):
             f"CMU dict cache not found at {path}. "
             "Run phonology.phoneme_lookup once to download it."
         )
+    # One bulk read, decompress and decode; splitlines() then runs in C
+    # instead of pulling ~135k lines through the text I/O layer one at a time.
     entries = {}
-    with open(path, encoding="latin-1") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith(";;;"):
-                continue
-            parts = line.split("  ", 1)
-            if len(parts) != 2:
-                continue
-            word, phones = parts
-            if "(" in word:
-                word = word[: word.index("(")]
-            word = word.lower()
-            entries.setdefault(word, []).append(phones.strip())
+    text = gzip.decompress(path.read_bytes()).decode("latin-1")
+    for line in text.splitlines():
+        if not line or line.startswith(";;;"):
+            continue
+        parts = line.split("  ", 1)
+        if len(parts) != 2:
+            continue
+        word, phones = parts
+        # Drop the "(2)"-style variant marker, if any
+        word = word.partition("(")[0].lower()
+        entries.setdefault(word, []).append(phones.strip())
     return entries
 
 
@@ -67,7 +70,7 @@ def _load_existing(path=_HETERONYMS_PATH):
     if not path.exists():
         return {}
     with open(path, encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f.read(), Loader=_YamlLoader) or {}
 
 
 def _format_tags(tags):
@@ -77,54 +80,61 @@ def _format_tags(tags):
     return "[" + ", ".join(str(t) for t in tags) + "]"
 
 
-_YAML_SAFE_KEY = re.compile(r"^[A-Za-z][A-Za-z0-9_'-]*$")
+# Keys made of an ASCII letter followed by letters, digits, _ ' or - can be
+# written bare; checked with set operations rather than a regex match.
+_YAML_KEY_START = frozenset(string.ascii_letters)
+_YAML_KEY_CHARS = frozenset(string.ascii_letters + string.digits + "_'-")
 
 
 def _format_key(word):
     """Quote a YAML key if it contains characters that need escaping."""
     word = str(word)
-    if _YAML_SAFE_KEY.match(word):
+    if word[:1] in _YAML_KEY_START and _YAML_KEY_CHARS.issuperset(word):
         return word
     return f'"{word}"'
 
 
 def _write_yaml(data, path=_HETERONYMS_PATH):
     """Write the heteronym table as clean, hand-editable YAML."""
-    curated = {}
-    uncurated = {}
-    for word in sorted(data, key=str):
-        entries = data[word]
+    # Sort once; partitioning in a single pass keeps both lists in order
+    curated = []
+    uncurated = []
+    for word, entries in sorted(data.items(), key=lambda item: str(item[0])):
         if any(e.get("tags") for e in entries):
-            curated[word] = entries
+            curated.append((word, entries))
         else:
-            uncurated[word] = entries
+            uncurated.append((word, entries))
+
+    # Assemble the whole document first and write it in one call
+    parts = [_YAML_HEADER]
+
+    if curated:
+        parts.append(
+            "\n# ── Curated entries "
+            "──────────────────────────────────────────────────────────\n\n"
+        )
+        for word, entries in curated:
+            parts.append(f"{_format_key(word)}:\n")
+            for entry in entries:
+                parts.append(
+                    f"- tags: {_format_tags(entry.get('tags', []))}\n"
+                    f'  phones: "{entry["phones"]}"\n'
+                )
+            parts.append("\n")
+
+    if uncurated:
+        parts.append(
+            "# ── Uncurated entries (fill in tags to enable disambiguation) "
+            "────────────\n\n"
+        )
+        for word, entries in uncurated:
+            parts.append(f"{_format_key(word)}:\n")
+            for entry in entries:
+                parts.append(f'- tags: []\n  phones: "{entry["phones"]}"\n')
+            parts.append("\n")
 
     with open(path, "w", encoding="utf-8") as f:
-        f.write(_YAML_HEADER)
-
-        if curated:
-            f.write(
-                "\n# ── Curated entries "
-                "──────────────────────────────────────────────────────────\n\n"
-            )
-            for word in sorted(curated, key=str):
-                f.write(f"{_format_key(word)}:\n")
-                for entry in curated[word]:
-                    f.write(f"- tags: {_format_tags(entry.get('tags', []))}\n")
-                    f.write(f'  phones: "{entry["phones"]}"\n')
-                f.write("\n")
-
-        if uncurated:
-            f.write(
-                "# ── Uncurated entries (fill in tags to enable disambiguation) "
-                "────────────\n\n"
-            )
-            for word in sorted(uncurated, key=str):
-                f.write(f"{_format_key(word)}:\n")
-                for entry in uncurated[word]:
-                    f.write("- tags: []\n")
-                    f.write(f'  phones: "{entry["phones"]}"\n')
-                f.write("\n")
+        f.write("".join(parts))
 
 
 def main():
@@ -1,16 +1,36 @@
 """Phoneme lookup via CMU Pronouncing Dictionary with g2p_en fallback."""
 
+import functools
+import gzip
+import http.client
 import logging
+import os
+import pickle
 import re
+import shutil
+import sys
 import urllib.request
+from collections import OrderedDict
 from pathlib import Path
 
 import yaml
-from g2p_en import G2p
+
+from phonology._yaml import _YamlLoader
 
 logger = logging.getLogger(__name__)
 
-g2p = G2p()
+# g2p_en loads a neural model and NLTK data, so it is only built the first
+# time a word is missing from the CMU dict.
+_g2p = None
+
+
+def _get_g2p():
+    """Return the shared g2p_en converter, creating it on first use."""
+    global _g2p
+    if _g2p is None:
+        from g2p_en import G2p
+        _g2p = G2p()
+    return _g2p
 
 # ── Phoneme mergers applied at load time ─────────────────────────────────────
 
@@ -18,54 +38,153 @@ g2p = G2p()
 # Set to False to maintain the AO / AA distinction.
 COT_CAUGHT_MERGER = True
 
-_MERGER_RE = re.compile(r"^AO(\d?)$")
+# AO with any stress digit (or none) → AA with the same digit.
+_MERGER_MAP = {"AO": "AA", "AO0": "AA0", "AO1": "AA1", "AO2": "AA2"}
 
 
 def _apply_mergers(phones):
     """Apply active phoneme mergers to a list of ARPAbet phones."""
     if COT_CAUGHT_MERGER:
-        phones = [_MERGER_RE.sub(r"AA\1", p) for p in phones]
+        merge = _MERGER_MAP.get
+        phones = [merge(p, p) for p in phones]
     return phones
 
 # ── Load CMU Pronouncing Dictionary from source ─────────────────────────────
 
 _CMUDICT_URL = "https://raw.githubusercontent.com/Alexir/CMUdict/master/cmudict-0.7b"
-_CMUDICT_CACHE = Path(__file__).with_name(".cmudict-0.7b")
+_CMUDICT_CACHE = Path(__file__).with_name(".cmudict-0.7b.gz")
+# Uncompressed cache written by earlier versions; migrated when found.
+_CMUDICT_LEGACY = Path(__file__).with_name(".cmudict-0.7b")
+_CMUDICT_PICKLE = Path(__file__).with_name(".cmudict-0.7b.pkl")
+# Bump when the shape of the parsed dict changes, to invalidate old pickles.
+_CMUDICT_FORMAT = 3
+
+# One CMU dict entry per line: the word up to any "(n)" variant marker,
+# the rest of the word, two spaces, then the phones.  ";;;" lines are
+# comments.
+_CMU_LINE_RE = re.compile(r"^(?!;;;)([^\s(]*)\S*  [ \t]*(\S.*)$", re.M)
+
+
+def _source_stamp(path):
+    """Return ``(mtime_ns, size)`` of *path*, identifying this copy of it."""
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_pickle_cache(path, key):
+    """Return the data pickled at *path*, or None if it cannot be used.
+
+    The cache is rejected if it is missing, unreadable, or was written
+    under a different *key*.  Keys include the source file's
+    _source_stamp() and any load-time settings (e.g. mergers), so a
+    replaced source or changed setting forces a rebuild.  The key is
+    pickled ahead of the data, so a stale cache is rejected without
+    unpickling the data.
+    """
+    try:
+        with open(path, "rb") as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+        return None
+
+
+def _write_pickle_cache(path, key, data):
+    """Pickle *key* then *data* to *path*, logging rather than raising on failure."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("Could not write cache %s: %s", path, exc)
+
 
+def _download_cmudict(url, cache_path):
+    """Stream the CMU dict from *url* into *cache_path*, gzip-compressed.
 
-def _load_cmudict(url=_CMUDICT_URL, cache_path=_CMUDICT_CACHE):
+    The download is written to a temporary file and only moved into place
+    once its length matches the server's Content-Length, so an interrupted
+    or truncated transfer never leaves a corrupt cache behind.
+    """
+    logger.info("Downloading CMU dict from %s …", url)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with urllib.request.urlopen(url) as resp, gzip.open(tmp, "wb") as out:
+            expected = resp.headers.get("Content-Length")
+            received = 0
+            while True:
+                chunk = resp.read(1 << 16)
+                if not chunk:
+                    break
+                out.write(chunk)
+                received += len(chunk)
+        if expected is not None and received != int(expected):
+            raise OSError(
+                f"incomplete download ({received} of {expected} bytes)"
+            )
+        os.replace(tmp, cache_path)
+    except (urllib.error.URLError, http.client.HTTPException, OSError) as exc:
+        tmp.unlink(missing_ok=True)
+        raise RuntimeError(
+            f"Failed to download CMU dict from {url}. "
+            "Check your network connection or supply the file manually "
+            f"(gzip-compressed) at {cache_path}."
+        ) from exc
+
+
+def _compress_legacy_cmudict(legacy_path, cache_path):
+    """Gzip an uncompressed CMU dict cache from *legacy_path* into *cache_path*."""
+    logger.info("Compressing existing CMU dict %s → %s", legacy_path, cache_path)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        with open(legacy_path, "rb") as src, gzip.open(tmp, "wb") as out:
+            shutil.copyfileobj(src, out, 1 << 16)
+        os.replace(tmp, cache_path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _load_cmudict(url=_CMUDICT_URL, cache_path=_CMUDICT_CACHE,
+                  pickle_path=_CMUDICT_PICKLE, legacy_path=_CMUDICT_LEGACY):
     """Download and parse the CMU Pronouncing Dictionary from source.
 
-    The raw file is cached locally so subsequent runs skip the download.
-    Returns a dict mapping lowercase words to lists of phoneme lists.
+    The raw file is cached locally (gzip-compressed) so subsequent runs
+    skip the download, and the parsed dict is pickled to *pickle_path* so
+    they also skip parsing.  An uncompressed cache left at *legacy_path*
+    by earlier versions is compressed into place rather than downloaded
+    again.  Returns a dict mapping lowercase words to tuples of phoneme
+    tuples.
     """
     if not cache_path.exists():
-        logger.info("Downloading CMU dict from %s …", url)
-        try:
-            urllib.request.urlretrieve(url, cache_path)
-        except (urllib.error.URLError, OSError) as exc:
-            raise RuntimeError(
-                f"Failed to download CMU dict from {url}. "
-                "Check your network connection or supply the file manually "
-                f"at {cache_path}."
-            ) from exc
+        if legacy_path.exists():
+            _compress_legacy_cmudict(legacy_path, cache_path)
+        else:
+            _download_cmudict(url, cache_path)
+
+    key = (_CMUDICT_FORMAT, COT_CAUGHT_MERGER, _source_stamp(cache_path))
+    cached = _read_pickle_cache(pickle_path, key)
+    if cached is not None:
+        return cached
 
+    # Only a few dozen distinct phone strings occur across ~134k entries;
+    # interning them lets every entry share one object per phone.
+    intern = sys.intern
+    # _apply_mergers() inlined: one dict lookup per phone, no call per line.
+    merge = _MERGER_MAP.get if COT_CAUGHT_MERGER else {}.get
     cmu = {}
-    with open(cache_path, encoding="latin-1") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith(";;;"):
-                continue
-            parts = line.split("  ", 1)
-            if len(parts) != 2:
-                continue
-            word, phones_str = parts
-            # Strip variant markers like "(1)", "(2)"
-            if "(" in word:
-                word = word[: word.index("(")]
-            word = word.lower()
-            phones = _apply_mergers(phones_str.strip().split())
-            cmu.setdefault(word, []).append(phones)
+    text = gzip.decompress(cache_path.read_bytes()).decode("latin-1")
+    for m in _CMU_LINE_RE.finditer(text):
+        word, phones_str = m.groups()
+        phones = tuple([intern(merge(p, p)) for p in phones_str.split()])
+        cmu.setdefault(word.lower(), []).append(phones)
+    # The dict is read-only from here on; tuples are ~40% smaller than lists.
+    for word, prons in cmu.items():
+        cmu[word] = tuple(prons)
+    _write_pickle_cache(pickle_path, key, cmu)
     return cmu
 
 
@@ -90,20 +209,30 @@ _CONTRACTION_PHONES = {
 # details.  Only entries whose ``tags`` list is non-empty are used.
 
 _HETERONYMS_PATH = Path(__file__).with_name("heteronyms.yaml")
+_HETERONYMS_PICKLE = Path(__file__).with_name(".heteronyms.pkl")
+# Bump when the pickled table's layout changes.
+_HETERONYMS_FORMAT = 1
 
 
-def _load_heteronyms(path=_HETERONYMS_PATH):
+def _load_heteronyms(path=_HETERONYMS_PATH, pickle_path=_HETERONYMS_PICKLE):
     """Load the heteronym table from YAML.
 
     Returns a dict mapping lowercase words to lists of
     ``(tag_frozenset, phone_list)`` tuples.  Entries with empty tags are
     skipped (they are uncurated placeholders for the user to fill in).
+
+    Parsing the YAML is slow, so the resolved table is pickled to
+    *pickle_path* and reused until the YAML file changes.
     """
     if not path.exists():
         logger.warning("Heteronym table not found at %s", path)
         return {}
+    key = (_HETERONYMS_FORMAT, _source_stamp(path))
+    cached = _read_pickle_cache(pickle_path, key)
+    if cached is not None:
+        return cached
     with open(path, encoding="utf-8") as f:
-        raw = yaml.safe_load(f) or {}
+        raw = yaml.load(f, Loader=_YamlLoader) or {}
     table = {}
     for word, entries in raw.items():
         resolved = []
@@ -115,6 +244,7 @@ def _load_heteronyms(path=_HETERONYMS_PATH):
             resolved.append((frozenset(tags), phones))
         if resolved:
             table[word.lower()] = resolved
+    _write_pickle_cache(pickle_path, key, table)
     return table
 
 
@@ -128,27 +258,132 @@ def get_phonemes(word, tag=None):
     When *tag* (a SpaCy fine-grained POS tag such as ``"NN"`` or ``"VBD"``)
     is provided and the word has multiple CMU Dict entries, the heteronym
     table is consulted to select the correct pronunciation.
+
+    Returns a tuple of phones.  Lookups are memoised by get_phonemes_lc(),
+    which callers holding an already-lowercase word can use directly;
+    clear_caches() resets the memo.
+    """
+    return get_phonemes_lc(word.lower(), tag)
+
+
+def get_phonemes_lc(word, tag=None):
+    """get_phonemes() for a *word* that is already lowercase.
+
+    The tag only matters for words in the heteronym table, so it is
+    dropped for every other word before the memoised lookup: a word seen
+    as ``NN``, ``NNP`` and ``VB`` then shares a single cache entry.
     """
-    word_lower = word.lower()
+    if tag is not None and word not in _HETERONYM_TABLE:
+        tag = None
+    return _get_phonemes_cached(word, tag)
+
 
+@functools.lru_cache(maxsize=65_536)
+def _get_phonemes_cached(word, tag):
+    """Memoised body of get_phonemes_lc().
+
+    Repeated tokens skip the lookup and, above all, the g2p_en model.
+    Results are tuples so the cached value cannot be mutated by callers.
+    Call clear_caches() after changing the tables or mergers.
+    """
     # Contraction suffixes that spaCy splits off
-    if word_lower in _CONTRACTION_PHONES:
-        return list(_CONTRACTION_PHONES[word_lower])
-
-    # Heteronym disambiguation when a POS tag is available
-    if tag and word_lower in _HETERONYM_TABLE:
-        entries = cmu.get(word_lower)
-        if entries and len(entries) > 1:
-            for tag_set, phones in _HETERONYM_TABLE[word_lower]:
-                if tag in tag_set:
-                    return _apply_mergers(phones)
+    if word in _CONTRACTION_PHONES:
+        return tuple(_CONTRACTION_PHONES[word])
 
-    result = cmu.get(word_lower)
+    result = cmu.get(word)
     if result:
+        # Heteronym disambiguation when a POS tag is available
+        if tag and len(result) > 1 and word in _HETERONYM_TABLE:
+            for tag_set, phones in _HETERONYM_TABLE[word]:
+                if tag in tag_set:
+                    return tuple(_apply_mergers(phones))
         return result[0]
-    # G2P fallback: g2p_en returns a mix of phonemes and spaces; filter to phonemes only
-    raw = g2p(word)
-    phones = _apply_mergers([p for p in raw if p.strip()])
+    # G2P fallback, reusing any output prefetched by get_phonemes_batch()
+    raw = _G2P_CACHE.get(word)
+    if raw is None:
+        raw = _g2p_phones(_get_g2p()(word))
+        _remember_g2p(word, raw)
+    else:
+        _G2P_CACHE.move_to_end(word)
+    phones = [sys.intern(p) for p in _apply_mergers(raw)]
     if phones:
-        return phones
-    return ["N/A"]
+        return tuple(phones)
+    return ("N/A",)
+
+
+# ── Batched g2p fallback ────────────────────────────────────────────────────
+# g2p_en tokenises and POS-tags its whole input before predicting each word,
+# so converting a sentence's unknown words in one call avoids paying that
+# per-call overhead for every word.  g2p_en output (before mergers) is kept
+# per word in a bounded LRU, so words converted before are not sent to the
+# model again; least recently used words are evicted past the bound.
+_G2P_CACHE = OrderedDict()
+_G2P_CACHE_SIZE = 65_536
+
+
+def _remember_g2p(word, raw):
+    """Store g2p_en output *raw* for *word*, evicting the oldest past the bound."""
+    _G2P_CACHE[word] = raw
+    _G2P_CACHE.move_to_end(word)
+    while len(_G2P_CACHE) > _G2P_CACHE_SIZE:
+        _G2P_CACHE.popitem(last=False)
+
+
+def _g2p_phones(raw):
+    """Filter g2p_en output, a mix of phonemes and spaces, to phonemes only."""
+    return [p for p in raw if p.strip()]
+
+
+def _prefetch_g2p(words):
+    """Convert *words* with a single g2p_en call.
+
+    Returns a dict mapping each word to its g2p_en phones.
+
+    g2p_en separates the words of its output with ``" "``.  Callers pass
+    only alphabetic words, each of which yields at least one output word,
+    so the split is aligned exactly when it has one group per input word.
+    Otherwise (e.g. g2p_en tokenised a word in two) an empty dict is
+    returned and the words fall back to individual calls.
+    """
+    groups = [[]]
+    for p in _get_g2p()(" ".join(words)):
+        if p == " ":
+            groups.append([])
+        else:
+            groups[-1].append(p)
+    if len(groups) != len(words):
+        return {}
+    return {word: _g2p_phones(raw) for word, raw in zip(words, groups)}
+
+
+def clear_caches():
+    """Drop all memoised lookups, e.g. after changing the tables or mergers.
+
+    This is the one supported way to reset phoneme lookup state; the
+    memo and the g2p_en output cache behind it are both cleared.
+    """
+    _get_phonemes_cached.cache_clear()
+    _G2P_CACHE.clear()
+
+
+def get_phonemes_batch(words, tags=None):
+    """Look up phonemes for many already-lowercase words at once.
+
+    Equivalent to ``[get_phonemes_lc(w, t) for w, t in zip(words, tags)]``,
+    but words that need the g2p_en fallback, and were not converted
+    before, go through one g2p_en call together first.  *tags* defaults
+    to no tags.
+    """
+    if tags is None:
+        tags = [None] * len(words)
+    misses = [
+        w for w in dict.fromkeys(words)
+        if w.isalpha()
+        and w not in _G2P_CACHE
+        and w not in _CONTRACTION_PHONES
+        and not cmu.get(w)
+    ]
+    if len(misses) > 1:
+        for word, raw in _prefetch_g2p(misses).items():
+            _remember_g2p(word, raw)
+    return [get_phonemes_lc(w, t) for w, t in zip(words, tags)]
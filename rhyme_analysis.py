@@ -16,8 +16,9 @@ Usage:
 """
 
 import sys
+from collections import OrderedDict
 
-from morpho_parser import parse
+from morpho_parser import parse_many
 from gloss import _ARPA_TO_IPA
 
 # ── Phoneme helpers ─────────────────────────────────────────────────────────
@@ -54,7 +55,7 @@ def _to_ipa(phone):
 
 def _seq_to_ipa(phones):
     """Convert a sequence of ARPAbet phones to an IPA string."""
-    return "".join(_to_ipa(p) for p in phones)
+    return "".join(map(_to_ipa, phones))
 
 
 # ── Fuzzy matching (soundex-like equivalence classes) ───────────────────────
@@ -84,6 +85,9 @@ _VOWEL_CLASS = {
     "AY": "DIPH_AY", "AW": "DIPH_AW", "OY": "DIPH_OY",
 }
 
+# Both tables in one, for a single probe per phone (their keys are disjoint).
+_CLASS = {**_CONSONANT_CLASS, **_VOWEL_CLASS}
+
 # Vowel classes that are one phonological step apart (height or backness).
 # Used to accept historical / dialectal near-rhymes (e.g. Pope's
 # "pierce"/"universe", "home"/"come", "food"/"blood").
@@ -113,7 +117,40 @@ def _vowels_nearby(a, b):
 
 def _soundex(phone):
     b = _base(phone)
-    return _VOWEL_CLASS.get(b) or _CONSONANT_CLASS.get(b, b)
+    return _CLASS.get(b, b)
+
+
+# ── Per-phone lookup tables ─────────────────────────────────────────────────
+# The helpers above depend only on the phone itself, and the ARPAbet
+# inventory is a few dozen symbols, so their results are precomputed into
+# tables and the helper names rebound to plain dict lookups.  Phones outside
+# the inventory (e.g. the "N/A" placeholder) are computed on first use.
+
+class _PhoneTable(dict):
+    """Map each phone to ``func(phone)``, filling in unseen phones lazily."""
+
+    def __init__(self, func, phones):
+        super().__init__((p, func(p)) for p in phones)
+        self._func = func
+
+    def __missing__(self, phone):
+        value = self[phone] = self._func(phone)
+        return value
+
+
+_KNOWN_PHONES = (
+    {v + s for v in _VOWELS for s in ("", "0", "1", "2")} | set(_CONSONANT_CLASS)
+)
+_BASE = _PhoneTable(_base, _KNOWN_PHONES)
+_STRESS = _PhoneTable(_stress, _KNOWN_PHONES)
+_IS_VOWEL = _PhoneTable(_is_vowel, _KNOWN_PHONES)
+_SOUNDEX = _PhoneTable(_soundex, _KNOWN_PHONES)
+_IPA = _PhoneTable(_to_ipa, _KNOWN_PHONES)
+_base = _BASE.__getitem__
+_stress = _STRESS.__getitem__
+_is_vowel = _IS_VOWEL.__getitem__
+_soundex = _SOUNDEX.__getitem__
+_to_ipa = _IPA.__getitem__
 
 
 def _phones_match(a, b, fuzzy=False):
@@ -138,36 +175,21 @@ def _line_tail(parse_results, max_syllables=_MAX_RIME_SYLLABLES):
     Returns a list of ``(phone, label, word)`` tuples spanning back from the
     end of the line up to *max_syllables* vowels deep.
     """
-    flat = []
-    for entry in parse_results:
-        for phone_str, label in entry["morphemes"]:
-            for phone in phone_str.split():
-                flat.append((phone, label, entry["word"]))
-
+    # Walk the line backwards so words before the tail are never expanded.
+    rev = []
     vowel_count = 0
-    cutoff = 0
-    for i in range(len(flat) - 1, -1, -1):
-        if _is_vowel(flat[i][0]):
-            vowel_count += 1
-            if vowel_count >= max_syllables:
-                cutoff = i
-                break
-
-    return flat[cutoff:]
-
-
-def _rime_start(phones):
-    """Index of the last stressed vowel (primary or secondary) in *phones*.
-
-    Falls back to the last vowel of any stress if none carry 1 or 2.
-    """
-    for i in range(len(phones) - 1, -1, -1):
-        if _is_vowel(phones[i]) and _stress(phones[i]) in ("1", "2"):
-            return i
-    for i in range(len(phones) - 1, -1, -1):
-        if _is_vowel(phones[i]):
-            return i
-    return 0
+    for entry in reversed(parse_results):
+        word = entry["word"]
+        for phone_str, label in reversed(entry["morphemes"]):
+            for phone in reversed(phone_str.split()):
+                rev.append((phone, label, word))
+                if _is_vowel(phone):
+                    vowel_count += 1
+                    if vowel_count >= max_syllables:
+                        rev.reverse()
+                        return rev
+    rev.reverse()
+    return rev
 
 
 def _common_suffix_len(rimes, max_len, fuzzy=False):
@@ -186,15 +208,25 @@ def _common_suffix_len(rimes, max_len, fuzzy=False):
 
 def _edit_distance_le_one(a, b):
     """True if *a* and *b* differ by at most one insertion or deletion."""
-    if a == b:
-        return True
+    if len(a) == len(b):
+        return a == b
     if abs(len(a) - len(b)) != 1:
         return False
     longer, shorter = (a, b) if len(a) > len(b) else (b, a)
-    for i in range(len(longer)):
-        if longer[:i] + longer[i + 1:] == shorter:
-            return True
-    return False
+    # Walk both in step; the first mismatch must be the extra element of
+    # *longer*, after which the rest has to line up exactly.
+    i = j = 0
+    skipped = False
+    while j < len(shorter):
+        if longer[i] == shorter[j]:
+            i += 1
+            j += 1
+        elif skipped:
+            return False
+        else:
+            i += 1
+            skipped = True
+    return True
 
 
 def _consonants_compatible(segments):
@@ -209,6 +241,7 @@ def _consonants_compatible(segments):
         return True, False
 
     ref_base = [_base(c) for c in segments[0]]
+    ref_sx = [_soundex(c) for c in segments[0]]
     fuzzy_needed = False
 
     for seg in segments[1:]:
@@ -217,7 +250,6 @@ def _consonants_compatible(segments):
             continue
 
         # Soundex-class match
-        ref_sx = [_soundex(c) for c in segments[0]]
         other_sx = [_soundex(c) for c in seg]
         if ref_sx == other_sx:
             fuzzy_needed = True
@@ -236,21 +268,26 @@ def _consonants_compatible(segments):
     return True, fuzzy_needed
 
 
-def _find_common_rime(tails):
+def _tail_vowels(tail):
+    """Indices of the vowel phones in a line tail."""
+    return [i for i, t in enumerate(tail) if _is_vowel(t[0])]
+
+
+def _find_common_rime(tails, tail_vi=None):
     """Longest common rime across *tails* via syllable-nucleus alignment.
 
     Matches vowel nuclei from the end of each tail outward, checking that
     intervening consonant material is compatible (exact, soundex, or within
     one consonant insertion/deletion).
 
+    *tail_vi* may give ``_tail_vowels()`` of each tail, for callers that
+    compare the same tail many times; it is computed here when omitted.
+
     Returns ``(slices, fuzzy)`` where *slices[i]* is the rime portion of
     *tails[i]* and *fuzzy* is ``True`` when near-rhyme tolerance was used.
     """
-    # Locate vowel positions in each tail
-    tail_vi = [
-        [i for i, (ph, _, _) in enumerate(tail) if _is_vowel(ph)]
-        for tail in tails
-    ]
+    if tail_vi is None:
+        tail_vi = [_tail_vowels(tail) for tail in tails]
     min_vowels = min((len(v) for v in tail_vi), default=0)
     if min_vowels == 0:
         return [[] for _ in tails], False
@@ -261,11 +298,13 @@ def _find_common_rime(tails):
 
     for n in range(1, min_vowels + 1):
         # ── vowel nuclei must match ──
-        vphs = [tails[ti][tail_vi[ti][-n]][0] for ti in range(len(tails))]
+        vphs = [tail[vi[-n]][0] for tail, vi in zip(tails, tail_vi)]
         ref = vphs[0]
+        # Each test implies the next (equal bases share a soundex class),
+        # so the looser ones only run when the stricter one fails.
         exact = all(_base(ref) == _base(v) for v in vphs[1:])
-        fuzzy = all(_soundex(ref) == _soundex(v) for v in vphs[1:])
-        nearby = all(
+        fuzzy = exact or all(_soundex(ref) == _soundex(v) for v in vphs[1:])
+        nearby = fuzzy or all(
             _soundex(ref) == _soundex(v) or _vowels_nearby(ref, v)
             for v in vphs[1:]
         )
@@ -284,17 +323,15 @@ def _find_common_rime(tails):
         if n == 1:
             # trailing consonants (after last vowel to end of tail)
             segs = [
-                [tails[ti][j][0]
-                 for j in range(tail_vi[ti][-1] + 1, len(tails[ti]))]
-                for ti in range(len(tails))
+                [ph for ph, _, _ in tail[vi[-1] + 1:]]
+                for tail, vi in zip(tails, tail_vi)
             ]
         else:
             # consonants between the two most-recently matched vowels
+            # (adjacent entries of tail_vi, so only consonants lie between)
             segs = [
-                [tails[ti][j][0]
-                 for j in range(tail_vi[ti][-n] + 1, tail_vi[ti][-(n - 1)])
-                 if not _is_vowel(tails[ti][j][0])]
-                for ti in range(len(tails))
+                [ph for ph, _, _ in tail[vi[-n] + 1:vi[-(n - 1)]]]
+                for tail, vi in zip(tails, tail_vi)
             ]
 
         c_ok, c_fuzzy = _consonants_compatible(segs)
@@ -315,25 +352,64 @@ def _find_common_rime(tails):
     if best_n == 0:
         return [[] for _ in tails], False
 
-    slices = [tails[ti][tail_vi[ti][-best_n]:] for ti in range(len(tails))]
+    slices = [tail[vi[-best_n]:] for tail, vi in zip(tails, tail_vi)]
     return slices, is_fuzzy
 
 
+# ── Line parse cache ───────────────────────────────────────────────────────
+# Parse results keyed by stripped line text, shared by the example drivers
+# (rhyme_scheme, analyze_poem, analyze_essay) so each distinct line is
+# parsed only once.  Least recently used lines are evicted past the bound.
+
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_SIZE = 8192
+
+
+def _parse_lines(lines):
+    """Parse already-stripped *lines*, batching the ones not yet cached.
+
+    Returns a list with a tuple of parse entries per line; callers must
+    not mutate them.
+    """
+    cache = _PARSE_CACHE
+    missing = [l for l in dict.fromkeys(lines) if l not in cache]
+    fresh = {
+        line: tuple(result)
+        for line, result in zip(missing, parse_many(missing))
+    }
+    out = []
+    for line in lines:
+        result = fresh.get(line)
+        if result is None:
+            result = cache[line]
+            cache.move_to_end(line)
+        out.append(result)
+    cache.update(fresh)
+    while len(cache) > _PARSE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return out
+
+
 # ── Public API ──────────────────────────────────────────────────────────────
 
-def analyse(lines):
+def analyse(lines, parsed=None):
     """Analyse the rime shared by two or more lines of rhyming poetry.
 
     Parameters
     ----------
     lines : list[str]
         Lines of poetry (≥ 2) assumed to rhyme with each other.
+    parsed : list, optional
+        Precomputed ``morpho_parser.parse()`` results for *lines*, in the
+        same order.  Lines are parsed here when omitted, as one
+        ``parse_many()`` batch.
 
     Returns
     -------
     dict
         ``rime_phones`` – ARPAbet phones of the canonical common rime
                           (taken from the first line).
+        ``rime_ipa``    – *rime_phones* in IPA (``""`` if there is none).
         ``fuzzy``       – ``True`` if fuzzy matching was needed.
         ``lines``       – per-line dicts, each containing:
 
@@ -342,11 +418,13 @@ def analyse(lines):
             ``rhyme_word`` – the last content word.
             ``rime``       – list of ``(phone, morpheme_label, word)``
                              tuples for the rime as realised in this line.
+            ``rime_ipa``   – the phones of ``rime`` in IPA.
             ``rime_morpheme_count`` – number of distinct morphemes
                              spanned by the rime (identified by
                              ``(label, word)`` pairs).
     """
-    parsed = [parse(l.strip()) for l in lines]
+    if parsed is None:
+        parsed = list(parse_many(l.strip() for l in lines))
     tails = [_line_tail(p) for p in parsed]
 
     slices, fuzzy = _find_common_rime(tails)
@@ -362,10 +440,16 @@ def analyse(lines):
             "parse": parsed[i],
             "rhyme_word": parsed[i][-1]["word"] if parsed[i] else "",
             "rime": seg,
+            "rime_ipa": _seq_to_ipa([p for p, _, _ in seg]) if seg else "",
             "rime_morpheme_count": morpheme_count,
         })
 
-    return {"rime_phones": rime_phones, "fuzzy": fuzzy, "lines": out_lines}
+    return {
+        "rime_phones": rime_phones,
+        "rime_ipa": _seq_to_ipa(rime_phones),
+        "fuzzy": fuzzy,
+        "lines": out_lines,
+    }
 
 
 # ── Formatting ──────────────────────────────────────────────────────────────
@@ -378,7 +462,7 @@ def format_analysis(result):
     if rime:
         kind = "fuzzy" if result["fuzzy"] else "exact"
         buf.append(
-            f"Common rime: {' '.join(rime)}  [{_seq_to_ipa(rime)}]  ({kind} match)"
+            f"Common rime: {' '.join(rime)}  [{result['rime_ipa']}]  ({kind} match)"
         )
     else:
         buf.append("No common rime detected.")
@@ -401,7 +485,7 @@ def format_analysis(result):
             ))
             n_morph = info["rime_morpheme_count"]
             buf.append(
-                f"  Rime [{_seq_to_ipa([p for p, _, _ in info['rime']])}] "
+                f"  Rime [{info['rime_ipa']}] "
                 f"spans {n_morph} morpheme{'s' if n_morph != 1 else ''}: "
                 f"{' + '.join(labels)}"
             )